@@ -22,7 +22,6 @@ from .services.copy_service import CopyService
 from .objects.app_context import AppContext
 from .objects.config import Config
 from .utilities.logging_utility import Logger
-from .services.interactive_selection_service import InteractiveSelectionService
 
 
 def flush_buffers(ctx: AppContext, config: Config):
@@ -42,11 +41,14 @@ def flush_buffers(ctx: AppContext, config: Config):
         ctx.logger.flush()
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """
     Main entry point for the gitree CLI tool.
 
     Handles the main workflow of the app.
+
+    Args:
+        argv (list[str] | None): The CLI arguments, sys.argv[1:] if None
     """
     
     # Record time for performance noting
@@ -58,7 +60,12 @@ def main() -> None:
 
 
     # Prepare the config object (this has all the args now)
-    config = ParsingService.parse_args(ctx)
+    config = ParsingService.parse_args(ctx, argv)
+
+    # The log is only shown with --verbose, so otherwise only the warnings and 
+    # errors are kept, and the debug/info messages are not formatted at all
+    if not config.verbose:
+        ctx.logger.set_level(Logger.WARNING)
     ctx.logger.log(Logger.INFO, 
         f"Left ParsingService at: {round((time.time()-start_time)*1000, 2)} ms")
 
@@ -77,7 +84,10 @@ def main() -> None:
 
     # Select files interactively if requested
     # NOTE: this one is currently broken
+    # NOTE: the service is imported here, since prompt_toolkit takes longer to
+    # import than the rest of the tool and is only needed for --interactive
     if config.interactive:
+        from .services.interactive_selection_service import InteractiveSelectionService
         resolved_root = InteractiveSelectionService.run(ctx, config, resolved_root)
 
 
@@ -5,9 +5,12 @@ Code file to house Config class.
 """
 
 # Default libs
-import argparse, json, os, sys, subprocess, platform
+import argparse, json, os, sys
+from collections import ChainMap
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 # Deps from this project
 from .app_context import AppContext
@@ -20,7 +23,7 @@ class Config:
         Config declared here from lowest to highest priority.
         Initializer to build four types of config.
         """
-        self.defaults: dict[str, Any] = self._build_default_config()
+        self.defaults: Mapping[str, Any] = self._build_default_config()
         self.global_cfg: dict[str, Any] = {}
         self.user_cfg: dict[str, Any] = self._build_user_config()
         self.cli: dict[str, Any] = vars(args)
@@ -32,6 +35,12 @@ class Config:
             self.global_cfg = {}
 
 
+        # All four configs chained in order of precedence, so a key is looked
+        # up with a single scan
+        self._chain: ChainMap[str, Any] = ChainMap(
+            self.cli, self.user_cfg, self.global_cfg, self.defaults)
+
+
     def _build_user_config(self) -> dict[str, Any]:
         """ 
         Returns a dict of the user config, if available.
@@ -39,13 +48,12 @@ class Config:
 
         config_path = Config._get_user_config_path()
 
-        # Make sure the configuration file has been setup
-        if not os.path.exists(config_path): return {}
-
-        with open(config_path, "r") as file:
-            user_cfg = json.load(file)
-
-        return user_cfg
+        # The configuration file may not have been setup, which is fine
+        try:
+            with open(config_path, "rb") as file:
+                return json.loads(file.read())
+        except FileNotFoundError:
+            return {}
     
 
     def _get(self, key: str) -> Any:
@@ -55,39 +63,41 @@ class Config:
         Precedence: CLI > user > global > defaults > fallback default
         """
 
-        if key in self.cli:
-            return self.cli[key]
-        if key in self.user_cfg:
-            return self.user_cfg[key]
-        if key in self.global_cfg:
-            return self.global_cfg[key]
-        if key in self.defaults:
-            return self.defaults[key]
-        
-        raise KeyError      # If key was not in any of the dicts
+        return self._chain[key]     # Raises KeyError if not in any of the dicts
 
 
     def __getattr__(self, name: str) -> Any:
         """
         Allow attribute-style access:
         cfg.max_items converted to cfg.get("max_items")
+
+        The resolved value is stored on the instance, so later reads of the same
+        attribute do not reach __getattr__ at all.
         """
+        if name.startswith("_"):
+            raise AttributeError(f"'Config' object has no attribute '{name}'")
+
         try:
-            return self._get(name)
+            value = self._get(name)
         except KeyError:
             raise AttributeError(f"'Config' object has no attribute '{name}'")
 
+        self.__dict__[name] = value
+        return value
+
 
     @staticmethod
-    def _build_default_config() -> dict[str, Any]:
+    @lru_cache(maxsize=1)
+    def _build_default_config() -> Mapping[str, Any]:
         """
         Returns the default configuration values.
 
         NOTE: This must contain all the configuration keys, since it is
-        meant to be a last resort.
+        meant to be a last resort. The mapping is built once and shared,
+        so it is read-only; copy it with dict() before modifying.
         """
 
-        return {
+        return MappingProxyType({
             # General Options
             "version": False,
             "config_user": False,
@@ -96,6 +106,7 @@ class Config:
 
             # Output & export options
             "zip": "",
+            "zip_compression": "deflated",
             "export": "",
 
             # Listing options
@@ -127,13 +138,22 @@ class Config:
 
             # Inner tool control (not to be given to the user)
             "no_printing": False  
-        }
+        })
     
 
     @staticmethod
     def _get_user_config_path() -> Path:
         """ Return the default user config path for gitree """
-        path = Path(".gitree/config.json")
+        return Path(".gitree/config.json")
+
+
+    @staticmethod
+    def _ensure_user_config_dir() -> Path:
+        """ 
+        Create the dir for the user config if needed, and return the config path.
+        Only to be used before writing the config, reads do not need the dir.
+        """
+        path = Config._get_user_config_path()
         path.parent.mkdir(exist_ok=True, parents=True)
         return path
 
@@ -143,11 +163,11 @@ class Config:
         """
         Creates a default config.json file with all defaults.
         """
-        config_path = Config._get_user_config_path()
+        config_path = Config._ensure_user_config_dir()
 
 
-        # Get default config values
-        config = Config._build_default_config()
+        # Get default config values (copied, since the defaults are shared)
+        config = dict(Config._build_default_config())
 
         # Delete "system/cli only" keys from the config dict
         del config["no_printing"]
@@ -180,6 +200,9 @@ class Config:
         """
         Opens config.json in the default text editor.
         """
+        # NOTE: imported here since they are only needed for --config-user
+        import shutil, subprocess
+
         config_path = Config._get_user_config_path()
 
         # Create config if it doesn't exist
@@ -199,24 +222,24 @@ class Config:
                 # Fall back to platform-specific default text editor
                 ctx.logger.log(Logger.WARNING, 
                     "No text editor found, fallback to platform-specific editors")
-                system = platform.system()
+                # NOTE: sys.platform is a constant, platform.system() may run uname
+                system = sys.platform
 
 
-                if system == "Darwin":  # macOS
+                if system == "darwin":  # macOS
                     # Use -t flag to open in default text editor, not browser
                     subprocess.run(["open", "-t", str(config_path)], check=True)
-                elif system == "Linux":
-                    # Try common editors in order of preference
+                elif system.startswith("linux"):
+                    # Try common editors in order of preference, looking them up
+                    # on PATH instead of trying to spawn each one
                     for cmd in ["xdg-open", "nano", "vim", "vi"]:
-                        try:
+                        if shutil.which(cmd):
                             subprocess.run([cmd, str(config_path)], check=True)
                             break
-                        except FileNotFoundError:
-                            continue
                     else:
                         raise Exception("No suitable text editor found")
                     
-                elif system == "Windows":
+                elif system == "win32":
                     # Use notepad as default text editor
                     subprocess.run(["notepad", str(config_path)], check=True)
 
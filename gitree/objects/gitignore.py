@@ -5,23 +5,202 @@ Code file for housing GitIgnore class
 """
 
 # Default libs
+from __future__ import annotations
+import os, glob, re
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, NamedTuple
 
 # Dependencies
-import pathspec
+# NOTE: pathspec is imported in _compile_spec, when a spec is first compiled, 
+# since most .gitignore patterns are matched without it, and its import is a 
+# large part of the startup
 
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
 
 
+# Max number of compiled specs kept alive by the caches below
+# NOTE: it bounds every cache holding a _SplitSpec, since those keep references
+# to the compiled specs. The parsed patterns alone are cheap, and cached more
+_SPEC_CACHE_SIZE = 128
+
+
+# NOTE: the parsed patterns and compiled specs below are cached by the path and
+# mtime of the .gitignore, so an edited file is read again. Use cache_clear() on
+# them to drop the cached entries (e.g. in tests)
+@lru_cache(maxsize=1024)
+def _parse_gitignore(path_str: str, mtime_ns: int) -> tuple[str, ...]:
+    """
+    Read and parse the patterns of a .gitignore file.
+
+    Args:
+        path_str (str): Path to the .gitignore file
+        mtime_ns (int): The mtime of the file, only used as part of the cache key
+
+    Returns:
+        tuple[str, ...]: Patterns of the file
+    """
+    try:
+        with open(path_str, "rb") as file:
+            raw_lines = file.read().splitlines()
+    except Exception:
+        raw_lines = []
+
+    patterns: list[str] = []
+    for raw in raw_lines:
+
+        # NOTE: blank and comment lines (often half of a .gitignore) are skipped
+        # on the raw bytes, so that only the pattern lines are decoded
+        raw = raw.strip()
+        if not raw or raw.startswith(b"#"):
+            continue
+
+        line = raw.decode("utf-8", errors="ignore").strip()
+        if not line:
+            continue
+
+        neg = line.startswith("!")
+        pat = line[1:] if neg else line
+        pat = pat.lstrip("/")
+        patterns.append(("!" + pat) if neg else pat)
+
+    return tuple(patterns)
+
+
+@lru_cache(maxsize=_SPEC_CACHE_SIZE)
+def _load_gitignore_spec(path_str: str, mtime_ns: int) -> "_SplitSpec":
+    """
+    Return the compiled spec of a .gitignore file.
+
+    Args:
+        path_str (str): Path to the .gitignore file
+        mtime_ns (int): The mtime of the file, only used as part of the cache key
+
+    Returns:
+        _SplitSpec: The compiled spec
+    """
+    return _split_patterns(_parse_gitignore(path_str, mtime_ns))
+
+
+class _SplitSpec(NamedTuple):
+    """
+    Gitignore patterns split by how they can be matched. Most .gitignore lines
+    are plain names ("node_modules", "build/") or extensions ("*.pyc"), which 
+    are matched against the path components with set lookups and str.endswith. 
+    Only the remaining patterns are matched with the compiled spec.
+    """
+    names: frozenset[str]               # "name", matches any path component
+    dir_names: frozenset[str]           # "name/", matches any dir component
+    suffixes: tuple[str, ...]           # "*suffix", matches any path component
+    spec: Callable[[str], Any] | None   # everything else, see _compile_spec
+
+
+@lru_cache(maxsize=_SPEC_CACHE_SIZE)
+def _split_patterns(patterns: tuple[str, ...]) -> _SplitSpec:
+    """
+    Split the patterns into a _SplitSpec.
+
+    Args:
+        patterns (tuple[str, ...]): The gitignore patterns
+
+    Returns:
+        _SplitSpec: The split patterns
+    """
+
+    # NOTE: with a negated pattern the last matching pattern decides, so the
+    # patterns can only be split if there is none
+    if any(pat.startswith("!") for pat in patterns):
+        return _SplitSpec(frozenset(), frozenset(), (), _get_spec(patterns))
+
+    names: set[str] = set()
+    dir_names: set[str] = set()
+    suffixes: list[str] = []
+    rest: list[str] = []
+
+    for pat in patterns:
+        is_dir_pat = pat.endswith("/")
+        body = pat[:-1] if is_dir_pat else pat
+
+        if not body or "/" in body or "\\" in body or body in (".", ".."):
+            rest.append(pat)
+        elif not glob.has_magic(body):
+            (dir_names if is_dir_pat else names).add(body)
+        elif (not is_dir_pat and body.startswith("*") and len(body) > 1 and 
+            not glob.has_magic(body[1:])):
+            suffixes.append(body[1:])
+        else:
+            rest.append(pat)
+
+    return _SplitSpec(frozenset(names), frozenset(dir_names), tuple(suffixes),
+        _get_spec(rest) if rest else None)
+
+
+def _get_spec(patterns: Iterable[str]) -> Callable[[str], Any]:
+    """
+    Return the compiled gitwildmatch spec for the patterns, compiling it only
+    if the same patterns have not been compiled before.
+
+    Args:
+        patterns (Iterable[str]): The gitignore patterns
+
+    Returns:
+        Callable[[str], Any]: The spec's match function, see _compile_spec
+    """
+    return _compile_spec(tuple(patterns))
+
+
+# Named groups in the regexes of pathspec's patterns, which can't be repeated
+# within a single regex
+_NAMED_GROUP_RE = re.compile(r"\(\?P<\w+>")
+
+
+# NOTE: compiled specs are keyed by their patterns, so identical .gitignore files
+# (common in monorepos) share a single spec. See _SPEC_CACHE_SIZE for the bound
+@lru_cache(maxsize=_SPEC_CACHE_SIZE)
+def _compile_spec(patterns: tuple[str, ...]) -> Callable[[str], Any]:
+    """
+    Compile the patterns into a function that tells if a (relative, POSIX) path
+    matches them.
+
+    NOTE: PathSpec.match_file searches the path with each pattern's regex in 
+    turn. Without negated patterns, any match means the path matches, so the
+    regexes are joined into one, and the path is searched in a single call.
+    With negated patterns the last matching one decides, which is left to
+    PathSpec.
+
+    Args:
+        patterns (tuple[str, ...]): The gitignore patterns
+
+    Returns:
+        Callable[[str], Any]: A function returning a truthy value on a match
+    """
+    import pathspec
+    spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+
+    regexes: list[str] = []
+    for pattern in spec.patterns:
+        if pattern.include is None:
+            continue
+        regex = getattr(pattern, "regex", None)
+        if (not pattern.include or regex is None or not isinstance(regex.pattern, str) or 
+            regex.flags != re.UNICODE):
+            return spec.match_file
+        regexes.append(_NAMED_GROUP_RE.sub("(?:", regex.pattern))
+
+    if not regexes:
+        return spec.match_file
+
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes)).search
+
+
 class GitIgnore:
     """
     Minimal gitignore loader/matcher.
 
-    - Create an object passing roots to it, and it's ready to be used.
-    - excluded(path) tells if path is ignored by any root's combined patterns.
+    - Create an object passing a .gitignore path to it, and it's ready to be used.
+    - excluded(path) tells if path is ignored by the file's patterns.
     """
 
     def __init__(self, ctx: AppContext, config: Config, gitignore_path: Path) -> None:
@@ -44,16 +223,20 @@ class GitIgnore:
         self.gitignore_depth = config.gitignore_depth
 
         # Setup specs for gitignore
-        self._specs: list[tuple[Path, pathspec.PathSpec]]
+        # NOTE: the roots are kept as strings ending with a separator
+        self._specs: list[tuple[str, _SplitSpec]]
         self._load_spec_from_gitignore(gitignore_path)
 
 
-    def excluded(self, item_path: Path) -> bool:
+    def excluded(self, item_path: Path | str, is_dir: bool | None = None) -> bool:
         """
         Determine whether the given path is excluded by the loaded gitignore patterns.
 
         Args:
-            item_path (Path): The path to check for exclusion
+            item_path (Path | str): The path to check for exclusion. A str must
+                already be an absolute path (e.g. DirEntry.path)
+            is_dir (bool | None): Whether the path is a dir, if already known
+                by the caller. It is checked on the filesystem otherwise
 
         Returns:
             bool: True if the path is ignored/excluded, otherwise False
@@ -61,35 +244,47 @@ class GitIgnore:
         if not self.enabled:
             return False
 
-        p = item_path.resolve(strict=False)
-
-        for root, spec in self._specs:
-            try:
-                rel = p.relative_to(root).as_posix()
-            except ValueError:
+        # NOTE: item paths are built from already resolved dirs, so they are only
+        # made absolute here. Resolving them would cost a realpath per check
+        if isinstance(item_path, str):
+            path_str = item_path
+        else:
+            p = item_path if item_path.is_absolute() else item_path.absolute()
+            path_str = str(p)
+
+        # NOTE: the relative path is sliced off the path string with the root's
+        # prefix, instead of building it with Path.relative_to per root
+        for root_prefix, split in self._specs:
+            if not path_str.startswith(root_prefix):
                 continue
-
-            if spec.match_file(rel):
-                return True
-            if p.is_dir() and spec.match_file(rel + "/"):
+            rel = path_str[len(root_prefix):]
+            if os.sep != "/":
+                rel = rel.replace(os.sep, "/")
+
+            names, dir_names, suffixes, spec = split
+
+            # Plain names and suffixes match any component of the relative path,
+            # and dir names any component that is a dir (all but the last one)
+            if names or suffixes or dir_names:
+                parts = rel.split("/")
+                for part in parts:
+                    if part in names or part.endswith(suffixes):
+                        return True
+                for part in parts[:-1]:
+                    if part in dir_names:
+                        return True
+
+            if spec is not None and spec(rel):
                 return True
 
-        return False
-
+            if dir_names or spec is not None:
+                if is_dir is None:
+                    is_dir = os.path.isdir(path_str)
+                if is_dir and (rel.rpartition("/")[2] in dir_names or
+                    spec is not None and spec(rel + "/")):
+                    return True
 
-    def _load_from_roots(self, roots: Iterable[Path]) -> None:
-        """
-        Load and combine gitignore patterns from all .gitignore files under the given roots.
-
-        Args:
-            roots (Iterable[Path]): Root directories to scan for .gitignore files
-        """
-        # Clears the specs if already present
-        self._specs = []
-
-        for root in self._norm_roots(roots):
-            pats = self._collect_patterns(root)
-            self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", pats)))
+        return False
 
 
     def _load_spec_from_gitignore(self, gitignore_path: Path) -> None:
@@ -102,128 +297,23 @@ class GitIgnore:
         """
         self._specs = []
 
-        gi = Path(gitignore_path).resolve(strict=False)
+        gi = Path(gitignore_path)
+        gi = gi if gi.is_absolute() else gi.absolute()
         root = gi.parent
 
-        patterns: list[str] = []
-        try:
-            lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
-        except Exception:
-            lines = []
-
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            neg = line.startswith("!")
-            pat = line[1:] if neg else line
-            pat = pat.lstrip("/")
-            patterns.append(("!" + pat) if neg else pat)
-
-        self._specs.append((root, pathspec.PathSpec.from_lines("gitwildmatch", patterns)))
-
-
-    def _norm_roots(self, roots: Iterable[Path]) -> list[Path]:
-        """
-        Normalize root paths into unique directory Paths.
-
-        Args:
-            roots (Iterable[Path]): Root paths to normalize
-
-        Returns:
-            list[Path]: A de-duplicated list of resolved directory roots
-        """
-        out: list[Path] = []
-        for r in roots:
-            rr = Path(r).resolve(strict=False)
-            rr = rr if rr.is_dir() else rr.parent
-            if rr not in out:
-                out.append(rr)
-        return out
-    
-
-    def _within_depth(self, root: Path, dirpath: Path) -> bool:
-        """
-        Check whether a directory is within the configured gitignore traversal depth
-        relative to the given root.
-
-        Args:
-            root (Path): The root directory used as the depth baseline
-            dirpath (Path): The directory path to test
-
-        Returns:
-            bool: True if dirpath is within depth, otherwise False
-        """
-        if self.gitignore_depth is None:
-            return True
         try:
-            return len(dirpath.relative_to(root).parts) <= self.gitignore_depth
-        except Exception:
-            return False
-        
-
-    def _collect_patterns(self, root: Path) -> list[str]:
-        """
-        Collect gitignore patterns from all .gitignore files under the root, prefixing
-        patterns by their relative directory to emulate nested .gitignore behavior.
-
-        Args:
-            root (Path): Root directory to scan
-
-        Returns:
-            list[str]: Combined list of patterns collected under the root
-        """
-        patterns: list[str] = []
-
-        for d in self._walk_dirs(root):
-            gi = d / ".gitignore"
-            if not gi.is_file():
-                continue
-
-            rel_dir = d.relative_to(root).as_posix()
-            prefix = "" if rel_dir == "." else rel_dir + "/"
-
-            try:
-                lines = gi.read_text(encoding="utf-8", errors="ignore").splitlines()
-            except Exception:
-                continue
+            mtime_ns = os.stat(gi).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
 
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
+        self._specs.append((self._root_prefix(root), _load_gitignore_spec(str(gi), mtime_ns)))
 
-                neg = line.startswith("!")
-                pat = line[1:] if neg else line
-                pat = prefix + pat.lstrip("/")
-                patterns.append(("!" + pat) if neg else pat)
 
-        return patterns
-    
-
-    def _walk_dirs(self, root: Path) -> Iterable[Path]:
+    @staticmethod
+    def _root_prefix(root: Path) -> str:
         """
-        Walk directories under the root using a stack-based traversal, respecting the
-        configured depth and skipping symlinks.
-
-        Args:
-            root (Path): Root directory to traverse
-
-        Returns:
-            Iterable[Path]: Directories discovered during traversal, including root
+        Return the root as a string ending with a separator, to slice relative
+        paths off the checked paths.
         """
-        stack = [root]
-        while stack:
-            d = stack.pop()
-            yield d
-
-            if not self._within_depth(root, d):
-                continue
-
-            try:
-                for c in d.iterdir():
-                    if c.is_dir() and not c.is_symlink():
-                        stack.append(c)
-            except PermissionError:
-                continue
+        s = str(root)
+        return s if s.endswith(os.sep) else s + os.sep
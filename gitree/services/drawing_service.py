@@ -35,6 +35,10 @@ class DrawingService:
             tree_data (dict[str, Any]): The resolved tree dict to draw
         """
 
+        # Nothing to draw if no items were resolved (already logged as an error)
+        if not tree_data:
+            return
+
         if config.format == "tree":
             DrawingService._draw_tree(ctx, config, tree_data)
 
@@ -56,6 +60,16 @@ class DrawingService:
             tree_data (dict[str, Any]): The resolved tree dict to draw
         """
 
+        # Bind the config values and constants used per line to locals once,
+        # since config attribute access goes through Config.__getattr__
+        emoji, no_color, files_first = config.emoji, config.no_color, config.files_first
+        file_emoji, empty_dir_emoji, normal_dir_emoji = FILE_EMOJI, EMPTY_DIR_EMOJI, NORMAL_DIR_EMOJI
+        branch, last, space, vert = BRANCH, LAST, SPACE, VERT
+        # NOTE: the lines are collected in a local list and written to the output
+        # buffer at once when the tree is done, instead of a write() call per line
+        lines: list[str] = []
+        write = lines.append
+
         def _p(x: Any) -> str:
             return x.as_posix() if hasattr(x, "as_posix") else str(x)
 
@@ -66,58 +80,95 @@ class DrawingService:
         def _is_dir(node: Any) -> bool:
             return isinstance(node, dict)
 
-        def _emoji_for(node: Any) -> str:
-            if not config.emoji:
+        def _emoji_for(node: Any, is_dir: bool) -> str:
+            if not emoji:
                 return ""
-            if _is_dir(node):
+            if is_dir:
                 ch = node.get("children", [])
-                return EMPTY_DIR_EMOJI if len(ch) == 0 else NORMAL_DIR_EMOJI
-            return FILE_EMOJI
-
-        def _children_sorted(children: list[Any]) -> list[Any]:
-            if config.files_first:
-                return sorted(children, key=lambda c: (0 if not _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
-            return sorted(children, key=lambda c: (0 if _is_dir(c) else 1, _name(_p(c.get("self") if _is_dir(c) else c)).lower()))
-
-        def _write_line(prefix: str, connector: str, node: Any) -> None:
-            p = _p(node.get("self") if _is_dir(node) else node)
-            label = _name(p)
-            em = _emoji_for(node)
-
-            if config.no_color:
-                color = Color.default
-            elif DrawingService._is_hidden(p):
-                color = Color.grey
-            elif _is_dir(node):
-                color = Color.cyan
+                return empty_dir_emoji if len(ch) == 0 else normal_dir_emoji
+            return file_emoji
+
+        def _children_sorted(children: list[Any]) -> list[tuple[bool, str, str, Any]]:
+            # Resolve (is_dir, path, label) once per child, so that the sort and 
+            # the line drawing below share the same values
+            entries = []
+            for c in children:
+                is_dir = _is_dir(c)
+                p = _p(c.get("self") if is_dir else c)
+                entries.append((is_dir, p, _name(p), c))
+
+            if files_first:
+                return sorted(entries, key=lambda e: (e[0], e[2].lower()))
+            return sorted(entries, key=lambda e: (not e[0], e[2].lower()))
+
+        def _write_line(prefix: str, connector: str, entry: tuple[bool, str, str, Any],
+            hidden: bool) -> None:
+            is_dir, p, label, node = entry
+            em = _emoji_for(node, is_dir)
+
+            # The color codes are put in the line directly (rather than calling
+            # Color.cyan etc.), so each line is built by a single f-string
+            if no_color:
+                code, reset = "", ""
+            elif hidden:
+                code, reset = Color.GREY, Color.RESET
+            elif is_dir:
+                code, reset = Color.CYAN, Color.RESET
             else:
-                color = Color.default
+                code, reset = "", ""
 
             if em:
-                ctx.output_buffer.write(f"{prefix}{connector}{em} {color(label)}")
+                write(f"{prefix}{connector}{em} {code}{label}{reset}")
             else:
-                ctx.output_buffer.write(f"{prefix}{connector}{color(label)}")
+                write(f"{prefix}{connector}{code}{label}{reset}")
 
         root_path = _p(tree_data.get("self"))
         root_label = _name(root_path)
-        root_emoji = _emoji_for(tree_data)
+        root_emoji = _emoji_for(tree_data, True)
 
         if root_emoji:
-            ctx.output_buffer.write(f"{root_emoji} "
-                f"{Color.cyan(root_label) if not config.no_color else root_label}")
+            write(f"{root_emoji} "
+                f"{Color.cyan(root_label) if not no_color else root_label}")
         else:
-            ctx.output_buffer.write(f"{Color.cyan(root_label) if not config.no_color else root_label}")
+            write(f"{Color.cyan(root_label) if not no_color else root_label}")
+
+        # Prefixes for the children of a dir, keyed by the dir's prefix and whether 
+        # it is the last child. Dirs at the same position share one prefix string
+        prefixes: dict[tuple[str, bool], str] = {}
 
-        def _rec(node: dict[str, Any], prefix: str) -> None:
+        # NOTE: whether a path is hidden is threaded down the tree (a child is
+        # hidden if its dir is, or if its own name starts with "."), instead of
+        # splitting every full path into its parts again
+        # NOTE: the tree is drawn with an explicit stack of the dirs being drawn 
+        # instead of recursing per dir, so deep trees don't hit the recursion limit.
+        # Each frame is (sorted children iterator, last index, prefix, dir hidden)
+        stack: list[tuple[Any, int, str, bool]] = []
+
+        def _push(node: dict[str, Any], prefix: str, node_hidden: bool) -> None:
             kids = _children_sorted(node.get("children", []))
-            for i, child in enumerate(kids):
-                connector = LAST if i == len(kids) - 1 else BRANCH
-                _write_line(prefix, connector, child)
-                if _is_dir(child):
-                    next_prefix = prefix + (SPACE if connector == LAST else VERT)
-                    _rec(child, next_prefix)
+            stack.append((iter(enumerate(kids)), len(kids) - 1, prefix, node_hidden))
+
+        _push(tree_data, "", DrawingService._is_hidden(root_path))
+
+        while stack:
+            kids_iter, last_i, prefix, node_hidden = stack[-1]
+            for i, child in kids_iter:
+                is_last = i == last_i
+                hidden = node_hidden or child[2].startswith(".")
+                _write_line(prefix, last if is_last else branch, child, hidden)
+                # NOTE: empty dirs have nothing to draw under them
+                if child[0] and child[3].get("children"):
+                    key = (prefix, is_last)
+                    next_prefix = prefixes.get(key)
+                    if next_prefix is None:
+                        next_prefix = prefixes[key] = prefix + (space if is_last else vert)
+                    # Draw the child dir first, and come back to the rest after it
+                    _push(child[3], next_prefix, hidden)
+                    break
+            else:
+                stack.pop()
 
-        _rec(tree_data, "")
+        ctx.output_buffer.write_many(lines)
 
 
     @staticmethod
@@ -146,16 +197,12 @@ class DrawingService:
             tree_data (dict[str, Any]): The resolved tree dict to draw
         """
 
-        def _norm(node: Any) -> Any:
-            if isinstance(node, dict):
-                s = node.get("self")
-                return {
-                    "self": s.as_posix() if hasattr(s, "as_posix") else str(s),
-                    "children": [_norm(c) for c in node.get("children", [])],
-                }
-            return node.as_posix() if hasattr(node, "as_posix") else str(node)
+        # NOTE: the tree dict is encoded as is, with the Paths in it converted by
+        # the encoder, instead of first copying it into a dict of strings
+        def _default(o: Any) -> str:
+            return o.as_posix() if hasattr(o, "as_posix") else str(o)
 
-        ctx.output_buffer.write(json.dumps(_norm(tree_data), indent=2))
+        ctx.output_buffer.write(json.dumps(tree_data, indent=2, default=_default))
 
 
     @staticmethod
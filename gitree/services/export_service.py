@@ -5,12 +5,18 @@ Code file for housing ExportService Class
 """
 
 # Default libs
+import json, os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 # Deps from this project
 from ..objects.app_context import AppContext
 from ..objects.config import Config
+from ..utilities.functions_utility import tree_files, BINARY_EXTENSIONS
+
+# Buffer size used to write the export file
+_WRITE_BUFSIZE = 1024 * 1024
 
 
 class ExportService:
@@ -37,7 +43,22 @@ class ExportService:
             return
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text("\n".join(lines), encoding="utf-8")
+
+        # NOTE: the lines are written one by one, instead of joining them into a
+        # single string first, which would hold a second copy of the export
+        # NOTE: the file is written in binary mode with each line encoded once,
+        # and newlines are translated the same way as text mode would do it
+        # NOTE: a 1 MiB buffer is used, so the many small line writes reach the
+        # file in few large write() calls
+        newline = os.linesep.encode("ascii")
+        with open(output_path, "wb", buffering=_WRITE_BUFSIZE) as file:
+            for i, line in enumerate(lines):
+                if i:
+                    file.write(newline)
+                data = line.encode("utf-8")
+                if newline != b"\n":
+                    data = data.replace(b"\n", newline)
+                file.write(data)
 
         ctx.output_buffer.clear()
 
@@ -51,11 +72,15 @@ class ExportService:
         out.append("")
         out.append("==== FILE CONTENTS ====")
 
-        for fp in ExportService._iter_files(tree_data):
+        files = tree_files(tree_data)
+        contents = ExportService._read_texts(files, config.max_file_size)
+
+        for fp, content in zip(files, contents):
+            header = f"FILE: {fp}"
             out.append("")
-            out.append(f"FILE: {fp}")
-            out.append("-" * (6 + len(str(fp))))
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
+            out.append(header)
+            out.append("-" * len(header))
+            out.append(content.rstrip("\n"))
 
         return out
 
@@ -70,11 +95,14 @@ class ExportService:
         out.append("## Files")
         out.append("")
 
-        for fp in ExportService._iter_files(tree_data):
+        files = tree_files(tree_data)
+        contents = ExportService._read_texts(files, config.max_file_size)
+
+        for fp, content in zip(files, contents):
             out.append(f"### File: {fp}")
             out.append("")
             out.append("```text")
-            out.append(ExportService._read_text(fp, config.max_file_size).rstrip("\n"))
+            out.append(content.rstrip("\n"))
             out.append("```")
             out.append("")
 
@@ -83,16 +111,17 @@ class ExportService:
 
     @staticmethod
     def _export_json(ctx: AppContext, config: Config, tree_data: dict[str, Any]) -> list[str]:
-        import json
-
         structure = ctx.output_buffer.get_value()
 
+        paths = tree_files(tree_data)
+        contents = ExportService._read_texts(paths, config.max_file_size)
+
         files = [
             {
                 "path": str(fp),
-                "content": ExportService._read_text(fp, config.max_file_size),
+                "content": content,
             }
-            for fp in ExportService._iter_files(tree_data)
+            for fp, content in zip(paths, contents)
         ]
 
         payload = {
@@ -100,36 +129,38 @@ class ExportService:
             "files": files,
         }
 
-        return [json.dumps(payload, indent=2, ensure_ascii=False)]
+        # NOTE: orjson (optional C encoder) gives the same output as json.dumps 
+        # here (2 space indent, non-ASCII kept as is), only much faster on large
+        # file contents. It is imported here since it is only needed for json
+        try:
+            import orjson
+        except ImportError:
+            return [json.dumps(payload, indent=2, ensure_ascii=False)]
+
+        return [orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")]
 
 
     @staticmethod
-    def _iter_files(tree_data: Any) -> list[Path]:
+    def _read_texts(paths: list[Path], max_size_mb: float = 1.0) -> list[str]:
         """
-        Flatten the resolved tree dict into a list of file Paths.
+        Read the files with _read_text, in the same order as given.
+
+        NOTE: the files are read by a thread pool, so that the reads of many 
+        (small) files overlap instead of waiting on each other
 
         Args:
-            tree_data (Any): A resolved tree dict with "self" and "children"
+            paths (list[Path]): The file paths to read
+            max_size_mb (float): Maximum file size in MB (default: 1.0)
 
         Returns:
-            list[Path]: A list of file paths
+            list[str]: The content of each file
         """
+        if len(paths) < 2:
+            return [ExportService._read_text(p, max_size_mb) for p in paths]
 
-        if not isinstance(tree_data, dict):
-            return []
-
-        out: list[Path] = []
-
-        def rec(node: dict[str, Any]) -> None:
-            for child in node.get("children", []):
-                if isinstance(child, dict):
-                    rec(child)
-                else:
-                    p = child if isinstance(child, Path) else Path(str(child))
-                    out.append(p)
-
-        rec(tree_data)
-        return out
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            return list(executor.map(
+                lambda p: ExportService._read_text(p, max_size_mb), paths))
 
 
     @staticmethod
@@ -144,26 +175,54 @@ class ExportService:
         Returns:
             str: File content, or placeholder for binary/large/inaccessible files
         """
-        p = path if isinstance(path, Path) else Path(str(path))
-
         try:
             # Check file size
-            size_bytes = p.stat().st_size
+            size_bytes = os.stat(path).st_size
             size_mb = size_bytes / (1024 * 1024)
 
             if size_mb > max_size_mb:
                 return f"[file too large: {size_mb:.2f}mb]"
 
-
-            # Check if binary (read first 8KB)
-            with open(p, 'rb') as f:
-                chunk = f.read(min(8192, size_bytes))
-                if b'\x00' in chunk:  # Null byte indicates binary
+            # NOTE: files of a known binary format are not opened at all
+            if path.suffix.lower() in BINARY_EXTENSIONS:
+                return "[binary file]"
+
+
+            # NOTE: the file is opened once with os.open and read with os.read, 
+            # instead of opening it once for the binary check and once more to 
+            # read it as text, each with a buffered file object
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                # Read the first 8KB and check if binary before reading the rest
+                head = b""
+                while len(head) < 8192:
+                    chunk = os.read(fd, 8192 - len(head))
+                    if not chunk:
+                        break
+                    head += chunk
+
+                if b'\x00' in head:    # Null byte indicates binary
                     return "[binary file]"
 
-
-            # Read as text
-            return p.read_text(encoding="utf-8", errors="ignore")
+                # Read the rest, unless the whole file fit in the first 8KB
+                chunks = [head]
+                remaining = size_bytes + 1 - len(head)      # +1 to see EOF of a grown file
+                chunk = head if len(head) == 8192 else b""
+                while chunk:
+                    chunk = os.read(fd, max(remaining, 8192))
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+            finally:
+                os.close(fd)
+
+            data = b"".join(chunks)
+
+
+            # Decode as text, with newlines translated like text mode reads do
+            text = data.decode("utf-8", errors="ignore")
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            return text
 
 
         except PermissionError:
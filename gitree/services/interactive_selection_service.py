@@ -11,6 +11,7 @@ from collections import defaultdict
 
 # Dependencies
 from prompt_toolkit.application import Application
+from prompt_toolkit.data_structures import Point
 from prompt_toolkit.layout import Layout
 from prompt_toolkit.layout.controls import FormattedTextControl
 from prompt_toolkit.layout.containers import Window, HSplit
@@ -44,8 +45,6 @@ class InteractiveSelectionService:
         Returns:
             dict: The updated resolved root dict in the same format as the input
         """
-        from prompt_toolkit.data_structures import Point
-
         tree: List[dict] = []
         folder_to_files: Dict[int, List[int]] = defaultdict(list)
         folder_to_subdirs: Dict[int, List[int]] = defaultdict(list)
@@ -117,23 +116,17 @@ class InteractiveSelectionService:
             """
             lines: StyleAndTextTuples = []
 
-            for i, item in enumerate(tree):
-                indent = "  " * item["depth"]
-
-                if item["checked"]:
-                    star = ("class:star", "[ ✓ ] ")
-                else:
-                    star = ("", "[ ] ")
-
-                label = item["path"].split("/")[-1]
-                if item["type"] == "dir":
-                    label += "/"
+            checked_star = ("class:star", "[ ✓ ] ")
+            unchecked_star = ("", "[ ] ")
 
+            # NOTE: the indent and the label line of each item are built once in
+            # _build_tree, since the whole tree is rendered again on every key press
+            for i, item in enumerate(tree):
                 cursor_style = "class:cursor" if i == cursor else ""
 
-                lines.append((cursor_style, indent))
-                lines.append(star)
-                lines.append((cursor_style, label + "\n"))
+                lines.append((cursor_style, item["indent"]))
+                lines.append(checked_star if item["checked"] else unchecked_star)
+                lines.append((cursor_style, item["line"]))
 
             return lines
 
@@ -228,7 +221,7 @@ class InteractiveSelectionService:
         app.run()
 
         selected_files = {
-            (root_path / item["path"])
+            item["path"]
             for item in tree
             if item["type"] == "file" and item["checked"]
         }
@@ -254,7 +247,7 @@ class InteractiveSelectionService:
 
         Args:
             resolved_root (dict): The resolved root dict with "self" and "children"
-            root (Path): The root path used to compute relative display paths
+            root (Path): The root path, displayed as "."
             depth (int): Current depth level for indentation
             tree (list[dict]): The flat render-order list to populate
             folder_to_files (dict[int, list[int]]): Directory index -> file indices mapping
@@ -266,12 +259,13 @@ class InteractiveSelectionService:
             dir_path = Path(str(dir_path))
 
         folder_index = len(tree)
-        rel_dir = dir_path.relative_to(root).as_posix() or "(root)"
+        label = dir_path.name if dir_path != root else "."
 
         tree.append({
             "type": "dir",
-            "path": rel_dir,
-            "depth": depth,
+            "path": dir_path,
+            "indent": "  " * depth,
+            "line": label + "/\n",
             "checked": False,
         })
 
@@ -290,13 +284,13 @@ class InteractiveSelectionService:
                 )
             else:
                 child_path = child if isinstance(child, Path) else Path(str(child))
-                rel_path = child_path.relative_to(root).as_posix()
 
                 file_index = len(tree)
                 tree.append({
                     "type": "file",
-                    "path": rel_path,
-                    "depth": depth + 1,
+                    "path": child_path,
+                    "indent": "  " * (depth + 1),
+                    "line": child_path.name + "\n",
                     "checked": False,
                 })
                 folder_to_files[folder_index].append(file_index)
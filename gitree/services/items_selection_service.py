@@ -6,7 +6,7 @@ Code file for the ItemsSelectionService class.
 
 # default libs
 from typing import Any
-import os, glob, time
+import os, sys, glob, time, bisect
 from pathlib import Path
 
 # Deps from this project
@@ -33,14 +33,18 @@ class ItemsSelectionService:
             dict: A dict of the resolved items
         """
 
+        # Matches of the glob patterns, shared by the paths, includes and excludes
+        # NOTE: kept for this call only, so a later call sees the filesystem as is
+        glob_matches: dict[str, list[str]] = {}
+
         # Resolve all the root paths first
         # NOTE: the root path is appended at the end of the list of resolved paths
         resolved_root_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.paths)
+            ctx, config, config.paths, glob_matches, must_exist=True)
         resolved_include_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.include)
+            ctx, config, config.include, glob_matches)
         resolved_exclude_paths = ItemsSelectionService._resolve_given_paths(
-            ctx, config, config.exclude)
+            ctx, config, config.exclude, glob_matches)
         ctx.logger.log(Logger.INFO, 
             f"Selected roots, includes, excludes at: {round((time.time()-start_time)*1000, 2)} ms")
         
@@ -51,25 +55,47 @@ class ItemsSelectionService:
             return {}
 
 
-        # Start from the parent dir and keep adding items recursively
+        # Every resolved path along with all of its parent dirs. This is used to
+        # check if a dir has any resolved path under it, with a single lookup
+        # NOTE: the paths are kept as strings, to be checked against DirEntry.path
+        resolved_dirs = {str(p) for t in resolved_root_paths for p in (t, *t.parents)}
+
+
+        # Sorted path prefixes of the paths that items are allowed under, and of the
+        # excluded paths, so that each item is checked with a binary search
+        include_prefixes = ItemsSelectionService._path_prefixes(
+            resolved_root_paths + resolved_include_paths[:-1])
+        exclude_prefixes = ItemsSelectionService._path_prefixes(resolved_exclude_paths[:-1])
+
+
+        # Prefixes of the (non-glob) paths given by the user, resolved once here
+        given_prefixes = ItemsSelectionService._path_prefixes(
+            [ItemsSelectionService._resolve_path(Path(os.getcwd()), path_str) 
+                for path_str in config.paths if not ItemsSelectionService._isglob(path_str)])
+
+
+        # Start from the parent dir and keep adding items under it
         # includes resolving hidden_files, gitignore, include and exclude
-        resolved_items, _ = ItemsSelectionService._resolve_items_rec(ctx, config, 
-            resolved_paths=resolved_root_paths, curr_depth=0, curr_entries=1,
-            gitignore_matcher=GitIgnoreMatcher(),
-            curr_dir=resolved_root_paths[-1], include_paths=resolved_include_paths[:-1], 
-            exclude_paths=resolved_exclude_paths[:-1])
+        resolved_items = ItemsSelectionService._resolve_items_iter(ctx, config, 
+            resolved_paths=frozenset(map(str, resolved_root_paths)), resolved_dirs=resolved_dirs, 
+            root_dir=resolved_root_paths[-1], include_prefixes=include_prefixes, 
+            exclude_prefixes=exclude_prefixes, given_prefixes=given_prefixes)
 
         return resolved_items
 
 
     @staticmethod
-    def _resolve_given_paths(ctx: AppContext, config: Config, attr: list[str]) -> list[Path]:
+    def _resolve_given_paths(ctx: AppContext, config: Config, attr: list[str], 
+        glob_matches: dict[str, list[str]], must_exist: bool = False) -> list[Path]:
         """
         Resolve the given paths in the CLI args. Handles glob patterns, simple paths,
         and common-parent-search.
 
         Args:
             attr (list[str]): An attr to resolve the matching paths for
+            glob_matches (dict[str, list[str]]): Matches of the already globbed 
+                patterns, filled in with the new ones
+            must_exist (bool): Exit with an error if a (non-glob) path does not exist
 
         Returns:
             list[Path]: A list of paths to be added, with the parent appended at the end
@@ -91,155 +117,325 @@ class ItemsSelectionService:
             if ItemsSelectionService._isglob(path_str):
 
                 # Include underlying and hidden items as well
-                matched_paths = glob.glob(path_str, recursive=True, include_hidden=True)
+                matches = glob_matches.get(path_str)
+                if matches is None:
+                    matches = glob_matches[path_str] = glob.glob(
+                        path_str, recursive=True, include_hidden=True)
+                for match_str in matches:
+                    calculated_paths.append(Path(match_str).resolve(strict=False))
 
                 # If the glob could not be resolved
-                if not matched_paths:
+                if not matches:
                     ctx.logger.log(Logger.WARNING, 
                         f"No matches found for glob pattern '{path_str}'")
-                    
-                # Append the matches to the calculated paths
-                for path_str in matched_paths:
-                    calculated_paths.append(Path(path_str).resolve(strict=False))
                 
             else:
-                path = Path(path_str)
-                resolved_path = (base_path / path).resolve(strict=False)
+                # Check that the path exists with a single stat, before resolving it
+                # NOTE: a missing path is not skipped, since the common parent of 
+                # the remaining paths could be a different root, or even a file
+                if must_exist:
+                    try:
+                        os.stat(base_path / path_str)
+                    except OSError:
+                        print(f"gitree: error: No such file or directory: '{path_str}'", 
+                            file=sys.stderr)
+                        raise SystemExit(1)
+
+                resolved_path = ItemsSelectionService._resolve_path(base_path, path_str)
                 calculated_paths.append(resolved_path)
 
 
         # Replace the placeholder for the parent path in the calculated paths
         if calculated_paths:
-            calculated_paths.append(Path(os.path.commonpath(calculated_paths)))
+            calculated_paths.append(ItemsSelectionService._common_parent(calculated_paths))
 
         return calculated_paths
     
 
     @staticmethod
-    def _resolve_items_rec(ctx: AppContext, config: Config, *,
-        resolved_paths: list[Path], curr_dir: Path, curr_depth: int, curr_entries: int,
-        include_paths: list[Path], exclude_paths: list[Path], 
-        gitignore_matcher: GitIgnoreMatcher) -> tuple[dict[str, Any], int]:
+    def _resolve_items_iter(ctx: AppContext, config: Config, *,
+        resolved_paths: frozenset[str], resolved_dirs: set[str], root_dir: Path, 
+        include_prefixes: tuple[str, ...], exclude_prefixes: tuple[str, ...], 
+        given_prefixes: tuple[str, ...]) -> dict[str, Any]:
         """
-        Resolve the paths recursively.
+        Resolve the items under the root dir, depth first.
+
+        NOTE: the traversal uses an explicit stack of the dirs being traversed instead
+        of recursing per dir. A dir is fully traversed before the rest of its parent,
+        so the order of the items and the --max-entries cut-off stay the same.
 
         Returns:
             dict[str, Any]: A dict of the resolved root and a list of children paths
-            int: current entries to keep track of the number of entries during recursion
         """
 
+        gitignore_matcher = GitIgnoreMatcher()
+
+        # Frames of the dirs being traversed, the innermost one last. Each frame is
+        # [node, children iterator, items added, depth, dir given, dir included, 
+        # within gitignore depth, check gitignore, added gitignore]
+        stack: list[list[Any]] = []
+        curr_entries = 1
+
+
+        def _enter_dir(node: dict[str, Any], curr_depth: int) -> None:
+            curr_dir = node["self"]
+
+            # Get the dir's children, sorted order, and files first
+            # NOTE: os.scandir is used since DirEntry caches the file type from readdir,
+            # which avoids a stat syscall per is_file()/is_dir() check
+            # NOTE: the keys are computed once per entry into the sorted tuples (with the
+            # scandir index to keep the order stable on equal names), and is_dir is 
+            # reused from the tuples in the loop below
+            # NOTE: the .gitignore is picked out of the listing in the same pass, 
+            # instead of probing the filesystem for it
+            children_to_add: list[tuple[bool, str, int, os.DirEntry]] = []
+            gitignore_entry = None
+            with os.scandir(curr_dir) as it:
+                for i, e in enumerate(it):
+                    if e.name == ".gitignore":
+                        gitignore_entry = e
+                    children_to_add.append((e.is_dir(), e.name.lower(), i, e))
+            children_to_add.sort()
+
+
+            # Decide once per dir which of the filters below can apply at all, so that
+            # with --no-gitignore and no excludes the per-item checks are skipped
+            # NOTE: items beyond --gitignore-depth are not added in any case
+            within_gitignore_depth = curr_depth <= config.gitignore_depth
+            check_gitignore = within_gitignore_depth and not config.no_gitignore
+
+
+            # If the current dir path is not under a path given by the user, then
+            # only items leading to the resolved paths are added from it
+            dir_given = ItemsSelectionService._isunder_prefixes(str(curr_dir), given_prefixes)
+
+            # If the current dir is under a root or include path, then so are all
+            # of its items, and they do not need to be checked one by one
+            dir_included = ItemsSelectionService._isunder_prefixes(str(curr_dir), include_prefixes)
+
+
+            # Setup gitignore object for this dir (if there is a .gitignore)
+            # NOTE: it is popped again once this dir is done, so that it only
+            # applies to this dir's subtree
+            added_gitignore = False
+            if check_gitignore and gitignore_entry is not None and gitignore_entry.is_file():
+                gitignore_matcher.add_gitignore(
+                    GitIgnore(ctx, config, gitignore_path=Path(gitignore_entry.path)))
+                added_gitignore = True
+
+            stack.append([node, iter(children_to_add), 0, curr_depth, dir_given, dir_included,
+                within_gitignore_depth, check_gitignore, added_gitignore])
+
+
+        # Bind the per-item config values to locals once, with the limits folded 
+        # to None when they are turned off
+        check_excludes = bool(exclude_prefixes)
+        no_files, hidden_items = config.no_files, config.hidden_items
+        max_items = None if config.no_max_items else config.max_items
+        max_entries = None if config.no_max_entries else config.max_entries
+
+        # Implementation for --max-depth
+        # NOTE: dirs at the max depth are added without being entered at all
+        max_depth = config.max_depth
+
         resolved_root: dict[str, Any] = {
-            "self": curr_dir,
+            "self": root_dir,
             "children": []
         }
+        if max_depth > 0:
+            _enter_dir(resolved_root, 0)
 
-        # Implementation for --max-depth
-        if curr_depth > config.max_depth - 1:
-            return resolved_root, curr_entries
-        
-
-        # Get the dir's children, sorted order, and files first
-        children_to_add = sorted(curr_dir.iterdir(), key=lambda p: (p.is_dir(), p.name.lower()))
 
+        while stack:
+            frame = stack[-1]
+            (node, children_to_add, _, curr_depth, dir_given, dir_included,
+                within_gitignore_depth, check_gitignore, added_gitignore) = frame
+            entered_dir = False
 
-        # Setup gitignore object for this dir (if there is a .gitignore)
-        if curr_depth <= config.gitignore_depth and (curr_dir / ".gitignore").is_file():
-            gitignore_matcher.add_gitignore(
-                GitIgnore(ctx, config, gitignore_path=(curr_dir / ".gitignore")))
+            # NOTE: the matcher is empty until a .gitignore is found, so it is not
+            # called at all for the items of dirs that have no .gitignore above them
+            check_gitignore = check_gitignore and gitignore_matcher.has_rules
+            dir_path: Path = node["self"]
 
+            # Now traverse the dir and add items, until a child dir is entered
+            for is_dir, _, _, entry in children_to_add:
+                is_file = not is_dir and entry.is_file()
 
-        items_added = 0
-        # Now traverse the dir and add items
-        for item_path in children_to_add:
+                # If --no-files is used, then skip files
+                if is_file and no_files: continue
 
-            # If --no-files is used, then skip files
-            if item_path.is_file() and config.no_files: continue
+                # NOTE: the checks below work on the path string, a Path is only
+                # built for the items that are added, by joining the name to the
+                # dir's Path (which skips parsing the whole path string again)
+                item_path = entry.path
 
 
-            # NOTE: this whole if-elif block bellow basically solves the problem of
-            # all the files and dirs appearing in the output, when only the patterns
-            # of some files in some dirs is mentioned.
+                # NOTE: this whole if-elif block bellow basically solves the problem of
+                # all the files and dirs appearing in the output, when only the patterns
+                # of some files in some dirs is mentioned.
 
 
-            # If current dir path is not given
-            if not ItemsSelectionService._dir_path_under_given_paths(config, curr_dir):
-                
-                # If it is a file and it is not is resolved paths
-                # and if the current dir we are working for, is not given in paths
-                if (item_path.is_file() and not item_path in resolved_paths):
-                    continue
+                # If current dir path is not given
+                if not dir_given:
+                    
+                    # If it is a file and it is not is resolved paths
+                    # and if the current dir we are working for, is not given in paths
+                    if (is_file and not item_path in resolved_paths):
+                        continue
 
-                # If it is a dir and it has no file under it that is in resolved_paths
-                elif (item_path.is_dir() and 
-                    not any(ItemsSelectionService._isunder(t, [item_path]) for t in resolved_paths)):
-                    continue
+                    # If it is a dir and it has no file under it that is in resolved_paths
+                    elif is_dir and item_path not in resolved_dirs:
+                        continue
 
 
-            # If reached --max-items or --max-entries, then exit
-            # NOTE: This is ok for now, but needs to be corrected later
-            if (not config.no_max_items and items_added >= config.max_items or
-                not config.no_max_entries and curr_entries >= config.max_entries): 
-                break
+                # If reached --max-items or --max-entries, then exit
+                # NOTE: This is ok for now, but needs to be corrected later
+                if (max_items is not None and frame[2] >= max_items or
+                    max_entries is not None and curr_entries >= max_entries): 
+                    break
 
 
-            # NOTE: DANGEROUS IF-STATEMENT AHEAD!
+                # NOTE: DANGEROUS IF-STATEMENT AHEAD!
 
-            # Check if it is not a hidden file/dir or hidden-items flag is used
-            # Check if the item is in resolved paths, or in include paths
-            # Check if the item is defined by an include pattern
-            # Or if there is a gitignore that says it is excluded
-            if ((config.hidden_items or not ItemsSelectionService._ishidden(item_path)) and
-                ItemsSelectionService._isunder(item_path, resolved_paths + include_paths) and 
-                not ItemsSelectionService._isunder(item_path, exclude_paths) and 
-                (not curr_depth > config.gitignore_depth and 
-                not gitignore_matcher.excluded(item_path))):  
+                # Check if it is not a hidden file/dir or hidden-items flag is used
+                # Check if the item is in resolved paths, or in include paths
+                # Check if the item is defined by an include pattern
+                # Or if there is a gitignore that says it is excluded
+                if ((hidden_items or not entry.name.startswith(".")) and
+                    (dir_included or 
+                        ItemsSelectionService._isunder_prefixes(entry.path, include_prefixes)) and 
+                    not (check_excludes and 
+                        ItemsSelectionService._isunder_prefixes(entry.path, exclude_prefixes)) and 
+                    within_gitignore_depth and 
+                    not (check_gitignore and gitignore_matcher.excluded(item_path, is_dir))):  
 
 
-                    items_added += 1
-                    curr_entries += 1  
-                    
-                    
-                    # If the item is a file then append directly, else resolve for it
-                    if item_path.is_file():
-                        resolved_root["children"].append(item_path)
-
-                    else:      
-                        resolved_dir, curr_entries = ItemsSelectionService._resolve_items_rec(
-                            ctx, config, resolved_paths=resolved_paths, 
-                            curr_entries=curr_entries, curr_dir=item_path, include_paths=include_paths, gitignore_matcher=gitignore_matcher,
-                            exclude_paths=exclude_paths, curr_depth=curr_depth+1)
-                            
-                        resolved_root["children"].append(resolved_dir)
+                        frame[2] += 1
+                        curr_entries += 1  
+                        
                         
+                        # If the item is a file then append directly, else enter it
+                        # and come back to the rest of this dir once it is done
+                        if is_file:
+                            node["children"].append(dir_path / entry.name)
+
+                        else:
+                            resolved_dir: dict[str, Any] = {
+                                "self": dir_path / entry.name,
+                                "children": []
+                            }
+                            node["children"].append(resolved_dir)
+
+                            # NOTE: a dir is not entered (no scandir, no .gitignore 
+                            # read) if nothing could be added under it anyway
+                            if (curr_depth + 1 < max_depth and
+                                (max_entries is None or curr_entries < max_entries)):
+                                _enter_dir(resolved_dir, curr_depth + 1)
+                                entered_dir = True
+                                break
+                            
+
+            # The dir is done if it was not left to enter a child dir
+            if not entered_dir:
+                stack.pop()
+                if added_gitignore:
+                    gitignore_matcher.pop_gitignore()
 
-        return resolved_root, curr_entries
+        return resolved_root
 
 
     @staticmethod
-    def _dir_path_under_given_paths(config: Config, dir_path: Path) -> bool:
-        """ 
-        Check if the dir path was given by the user
+    def _resolve_path(base_path: Path, path_str: str) -> Path:
         """
+        Resolve a (non-glob) given path against the cwd.
 
-        given_paths: list[Path] = []
+        Args:
+            base_path (Path): The cwd
+            path_str (str): The given path
 
-        for path_str in config.paths:
-            if not ItemsSelectionService._isglob(path_str): 
-                given_paths.append(Path(path_str).resolve(strict=False))
+        Returns:
+            Path: The resolved path
+        """
+
+        # NOTE: on POSIX the cwd from os.getcwd() is already a real path, so a path 
+        # that is just the cwd (e.g. the default ".") is returned without a realpath.
+        # On Windows getcwd keeps the typed case, short names and subst drives, 
+        # which would not match the resolved form of the other paths
+        if os.name == "posix" and os.path.normpath(path_str) == ".":
+            return base_path
+
+        return (base_path / path_str).resolve(strict=False)
+
+
+    @staticmethod
+    def _common_parent(paths: list[Path]) -> Path:
+        """
+        Find the longest common parent of the (resolved) paths, by comparing the
+        parts of each path with the common parts found so far.
+
+        Args:
+            paths (list[Path]): The paths to find the common parent for
+
+        Returns:
+            Path: The common parent (or the path itself, if only one is given)
+        """
+
+        common = paths[0].parts
+        for path in paths[1:]:
+            parts = path.parts
+            n = 0
+            for a, b in zip(common, parts):
+                if a != b:
+                    break
+                n += 1
+            common = common[:n]
+
+        # NOTE: paths with no common part (e.g. on different drives) are left to
+        # os.path.commonpath, which raises for them
+        if not common:
+            return Path(os.path.commonpath(paths))
+
+        return Path(*common)
 
-        return ItemsSelectionService._isunder(dir_path, given_paths)
-    
 
     @staticmethod
     def _isglob(path_str: str) -> bool:
-        return any(c in path_str for c in "*?[")
+        return glob.has_magic(path_str)
     
 
     @staticmethod
-    def _ishidden(item_path: Path) -> bool:
-        return item_path.name.startswith(".")
-    
+    def _path_prefixes(paths: list[Path]) -> tuple[str, ...]:
+        """
+        Build the sorted prefixes to check with _isunder_prefixes. Each path gets a
+        trailing separator, and paths that are under another given path are dropped.
+
+        Args:
+            paths (list[Path]): The paths to build the prefixes for
+
+        Returns:
+            tuple[str, ...]: The sorted prefixes
+        """
+
+        prefixes: list[str] = []
+        for s in sorted({str(p) if str(p).endswith(os.sep) else str(p) + os.sep 
+            for p in paths}):
+
+            # NOTE: a path that is under the previously kept one is sorted right 
+            # after it, so comparing with the last kept prefix is enough
+            if not (prefixes and s.startswith(prefixes[-1])):
+                prefixes.append(s)
+
+        return tuple(prefixes)
     
+
     @staticmethod
-    def _isunder(path: Path, parents: list[Path]) -> bool:
-        return any(path == p or path.is_relative_to(p) for p in parents)
+    def _isunder_prefixes(path_str: str, prefixes: tuple[str, ...]) -> bool:
+        """
+        Check if the path is one of, or is under one of the paths that the prefixes
+        were built from by _path_prefixes. Only the prefix sorted right before the
+        path can be one of its parents.
+        """
+
+        path_str = path_str if path_str.endswith(os.sep) else path_str + os.sep
+        i = bisect.bisect_right(prefixes, path_str)
+        return i > 0 and path_str.startswith(prefixes[i - 1])
@@ -17,6 +17,10 @@ from ..objects.config import Config
 from ..objects.app_context import AppContext
 
 
+# The parser is built on the first call to parse_args, and reused afterwards
+_PARSER: argparse.ArgumentParser | None = None
+
+
 class ParsingService:
     """
     CLI parsing service for gitree tool. 
@@ -26,37 +30,37 @@ class ParsingService:
     """
 
     @staticmethod
-    def parse_args(ctx: AppContext) -> Config:
+    def parse_args(ctx: AppContext, argv: list[str] | None = None) -> Config:
         """
         Public function to parse command-line arguments for the gitree tool.
 
+        Args:
+            ctx (AppContext): The application context
+            argv (list[str] | None): The arguments to parse, sys.argv[1:] if None
+
         Returns:
             Config: Configuration object to be used in-place of args
         """
 
-        ap = argparse.ArgumentParser(
-            description="Print a directory tree (respects .gitignore).",
-            formatter_class=argparse.RawTextHelpFormatter,
-            epilog=ParsingService._examples_text()
-        )
+        ap = ParsingService._get_parser(ctx)
+        args = ap.parse_args(argv)
 
-        ParsingService._add_positional_args(ctx, ap)
-        ParsingService._add_general_options(ctx, ap)
-        ParsingService._add_io_flags(ctx, ap)
-        ParsingService._add_listing_flags(ctx, ap)
-        ParsingService._add_listing_control_flags(ctx, ap)
 
-        args = ap.parse_args()
-        ctx.logger.log(ctx.logger.DEBUG, f"Parsed arguments: {args}")
+        # Prepare the config object to return from this function
+        # NOTE: every option uses argparse.SUPPRESS as its default, so that only the 
+        # options actually given on the CLI override the user config and defaults
+        config = Config(ctx, args)
 
+        # NOTE: the namespace only has the options given on the CLI, so the 
+        # effective format is logged along with it
+        ctx.logger.log(ctx.logger.DEBUG, 
+            f"Parsed arguments: {args}, format={config.format!r}")
 
-        # Correct the arguments before returning to avoid complexity
-        # in implementation in main function, then return a Config object
-        args = ParsingService._correct_args(ctx, args)
 
+        # Correct the arguments before returning to avoid complexity
+        # in implementation in main function
+        config = ParsingService._correct_args(ctx, config)
 
-        # Prepare the config object to return from this function
-        config = Config(ctx, args)
         config.no_printing = config.copy or config.export or config.zip 
         if not config.no_color:
             config.no_color = config.copy or config.export
@@ -64,6 +68,34 @@ class ParsingService:
         return ParsingService._fix_contradicting_args(ctx, config)
     
 
+    @staticmethod
+    def _get_parser(ctx: AppContext) -> argparse.ArgumentParser:
+        """
+        Return the argument parser, building it on the first call only.
+
+        Returns:
+            argparse.ArgumentParser: The parser with all the gitree arguments
+        """
+        global _PARSER
+
+        if _PARSER is None:
+            ap = argparse.ArgumentParser(
+                description="Print a directory tree (respects .gitignore).",
+                formatter_class=argparse.RawTextHelpFormatter,
+                epilog=ParsingService._examples_text()
+            )
+
+            ParsingService._add_positional_args(ctx, ap)
+            ParsingService._add_general_options(ctx, ap)
+            ParsingService._add_io_flags(ctx, ap)
+            ParsingService._add_listing_flags(ctx, ap)
+            ParsingService._add_listing_control_flags(ctx, ap)
+
+            _PARSER = ap
+
+        return _PARSER
+
+
     @staticmethod
     def _fix_contradicting_args(ctx: AppContext, config: Config) -> Config:
         """
@@ -74,24 +106,26 @@ class ParsingService:
 
     
     @staticmethod
-    def _correct_args(ctx: AppContext, args: argparse.Namespace) -> argparse.Namespace:
+    def _correct_args(ctx: AppContext, config: Config) -> Config:
         """
-        Correct and validate CLI arguments in place.
+        Correct and validate the resolved arguments in place.
         """
         
-        if getattr(args, "export", None) is not None:
-            args.export = ParsingService._fix_output_path(
-                ctx, args.export,
+        if config.export:
+            config.export = ParsingService._fix_output_path(
+                ctx, config.export,
                 default_extensions={"tree": ".txt", "json": ".json", "md": ".md"},
-                format_str=args.format
+                format_str=config.format
             )
 
-        if getattr(args, "zip", None) is not None:
-            args.zip = ParsingService._fix_output_path(ctx, args.zip, default_extension=".zip")
+        if config.zip:
+            config.zip = ParsingService._fix_output_path(ctx, config.zip, default_extension=".zip")
 
-        ctx.logger.log(ctx.logger.DEBUG, f"Corrected arguments: {args}")
+        ctx.logger.log(ctx.logger.DEBUG, 
+            f"Corrected arguments: format={config.format!r}, export={config.export!r}, "
+            f"zip={config.zip!r}")
 
-        return args
+        return config
     
 
     @staticmethod
@@ -194,6 +228,11 @@ class ParsingService:
         io.add_argument("-z", "--zip", 
             default=argparse.SUPPRESS, 
             help="Create a zip archive of the given directory respecting gitignore rules.")
+
+        io.add_argument("--zip-compression", choices=["deflated", "stored", "bzip2"],
+            default=argparse.SUPPRESS, 
+            help="Compression method for --zip. 'stored' skips compression, which is"
+                " fastest (default: deflated)")
         
         io.add_argument("--export", 
             default=argparse.SUPPRESS, 
@@ -206,7 +245,7 @@ class ParsingService:
         listing = ap.add_argument_group("listing options")
 
         listing.add_argument("--format", choices=["tree", "json", "md"], 
-            default="tree", help="Format output only")
+            default=argparse.SUPPRESS, help="Format output only")
 
         listing.add_argument("--max-items", type=max_items_int, 
             default=argparse.SUPPRESS, 
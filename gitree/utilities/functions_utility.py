@@ -6,6 +6,8 @@ Utility functions for the tool.
 
 # Default libs
 import argparse
+from pathlib import Path
+from typing import Any
 
 
 def max_items_int(v: str) -> int:
@@ -46,3 +48,51 @@ def max_entries_int(v: str) -> int:
         raise argparse.ArgumentTypeError(
             "--max-entries must be >= 1 and <=10000")
     return n
+
+
+# Extensions of already compressed formats (images, media, archives, ...)
+# NOTE: shared by the zipping service, which stores these files as is, and the
+# export service, which reports them as binary without reading them
+COMPRESSED_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+    ".mp3", ".mp4", ".mkv", ".webm", ".mov", ".avi", ".flac", ".ogg",
+    ".zip", ".gz", ".tgz", ".xz", ".bz2", ".zst", ".7z", ".rar", ".jar", ".whl",
+    ".pdf", ".woff", ".woff2",
+})
+
+# Extensions of known binary formats, the compressed ones included
+BINARY_EXTENSIONS = COMPRESSED_EXTENSIONS | frozenset({
+    ".tar", ".ttf", ".otf",
+    ".exe", ".dll", ".so", ".dylib", ".o", ".a", ".pyc", ".pyo", ".class", ".wasm",
+})
+
+
+def tree_files(tree_data: Any) -> list[Path]:
+    """
+    Flatten a resolved tree dict into a list of its file Paths, in tree order.
+    Shared by the export and zipping services.
+
+    Args:
+        tree_data (Any): A resolved tree dict with "self" and "children"
+
+    Returns:
+        list[Path]: A list of file paths
+    """
+    if not isinstance(tree_data, dict):
+        return []
+
+    out: list[Path] = []
+
+    # NOTE: an explicit stack of children iterators is used instead of recursion,
+    # so deep trees don't hit the recursion limit
+    stack = [iter(tree_data.get("children", []))]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, dict):
+                stack.append(iter(child.get("children", [])))
+                break
+            out.append(child if isinstance(child, Path) else Path(str(child)))
+        else:
+            stack.pop()
+
+    return out
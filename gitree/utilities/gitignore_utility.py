@@ -14,6 +14,11 @@ from ..objects.config import Config
 
 
 class GitIgnoreMatcher:
+    """
+    Stack of the GitIgnore objects that apply to the directory currently being
+    traversed. A .gitignore is pushed when its dir is entered and popped when
+    the dir is left, so each check only scans the ancestors' rules.
+    """
 
     def __init__(self):
         self.gitignores: list[GitIgnore] = []
@@ -22,10 +27,22 @@ class GitIgnoreMatcher:
     def add_gitignore(self, gitignore: GitIgnore):
         self.gitignores.append(gitignore)
 
+
+    def pop_gitignore(self) -> GitIgnore:
+        return self.gitignores.pop()
+
+
+    @property
+    def has_rules(self) -> bool:
+        """
+        Whether any .gitignore applies to the dir currently being traversed.
+        """
+        return bool(self.gitignores)
+
     
-    def excluded(self, item_path: Path) -> bool:
+    def excluded(self, item_path: Path | str, is_dir: bool | None = None) -> bool:
         for gitignore in self.gitignores:
-            if gitignore.excluded(item_path):
+            if gitignore.excluded(item_path, is_dir):
                 return True
             
         return False
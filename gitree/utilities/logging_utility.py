@@ -4,6 +4,10 @@
 Code file for housing Logger and OutputBuffer classes.
 """
 
+# Default libs
+import sys
+
+# Deps from this project
 from ..utilities.color_utility import Color
 
 
@@ -21,20 +25,45 @@ class Logger:
     WARNING = 30
     ERROR = 40
 
+    # Names of the log levels, and their colored "[LEVEL]" tags
+    # NOTE: both are built once per process, the tags are not built again 
+    # on every log() call
+    _LEVEL_NAMES: dict[int, str] = {
+        DEBUG: "DEBUG",
+        INFO: "INFO",
+        WARNING: "WARNING",
+        ERROR: "ERROR",
+    }
+    _LEVEL_TAGS: dict[int, str] = {
+        DEBUG: Color.blue("[DEBUG]"),
+        INFO: Color.green("[INFO]"),
+        WARNING: Color.yellow("[WARNING]"),
+        ERROR: Color.red("[ERROR]"),
+    }
+
 
     def __init__(self):
         """
         Initialize the logger with an empty buffer.
         """
 
-        self._LEVEL_NAMES: dict[int, str] = {
-            10: "DEBUG",
-            20: "INFO",
-            30: "WARNING",
-            40: "ERROR",
-        }
         self._messages: list[str] = []
 
+        # Messages below this level are dropped by log() before being formatted
+        self._level: int = self.DEBUG
+
+
+    def set_level(self, level: int) -> None:
+        """
+        Set the lowest level of the messages to store. Messages below it are
+        dropped without being formatted.
+
+        Args:
+            level: One of DEBUG, INFO, WARNING or ERROR
+        """
+
+        self._level = level
+
 
     def log(self, level: str | None, message: str) -> None:
         """
@@ -46,7 +75,7 @@ class Logger:
 
         if level is None:
             self._messages.append(message)
-        else:
+        elif level >= self._level:
             self._messages.append(self._append_level(level, message))
 
 
@@ -59,8 +88,11 @@ class Logger:
             print("No log messages to display.")
             return
         
-        for message in self._messages:
-            print(message)
+        # Write all messages at once rather than a print() per message
+        write = sys.stdout.write
+        write("\n".join(self._messages))
+        write("\n")
+        sys.stdout.flush()
         self.clear()
 
 
@@ -114,20 +146,7 @@ class Logger:
             The message prefixed with the log level
         """
 
-        label = self._LEVEL_NAMES[level]
-
-        if level == self.DEBUG:
-            colored_label = Color.blue(f"[{label}]")
-        elif level == self.INFO:
-            colored_label = Color.green(f"[{label}]")
-        elif level == self.WARNING:
-            colored_label = Color.yellow(f"[{label}]")
-        elif level == self.ERROR:
-            colored_label = Color.red(f"[{label}]")
-        else:
-            colored_label = f"[{label}]"
-
-        return f"{colored_label} {message}"
+        return f"{self._LEVEL_TAGS[level]} {message}"
 
 
 class OutputBuffer(Logger):
@@ -141,6 +160,10 @@ class OutputBuffer(Logger):
         """
         super().__init__()
 
+        # NOTE: snapshot of the buffer returned by get_value, dropped on every
+        # write/clear, so that repeated get_value calls don't copy the buffer again
+        self._value: tuple[str, ...] | None = None
+
 
     def write(self, message: str) -> None:
         """
@@ -149,17 +172,39 @@ class OutputBuffer(Logger):
         Args:
             message: The message to write
         """
-        super().log(level=None, message=message)
+        self._value = None
+        self._messages.append(message)
+
+
+    def write_many(self, messages: list[str]) -> None:
+        """
+        Write many messages to the logger's output storage at once.
+
+        Args:
+            messages: The messages to write, in order
+        """
+        self._value = None
+        self._messages.extend(messages)
 
 
-    def get_value(self) -> list[str]:
+    def get_value(self) -> tuple[str, ...]:
         """
-        Get the entire contents of the output buffer as a list of strings.
+        Get the entire contents of the output buffer as a read-only snapshot.
 
         Returns:
-            str: The contents of the output buffer
+            tuple[str, ...]: The contents of the output buffer
+        """
+        if self._value is None:
+            self._value = tuple(self._messages)
+        return self._value
+
+
+    def clear(self) -> None:
+        """
+        Clear all stored lines without printing them.
         """
-        return super().get_logs()
+        self._value = None
+        super().clear()
     
 
     def flush(self) -> None:
@@ -171,6 +216,10 @@ class OutputBuffer(Logger):
         if super().empty():
             return      # Do not print anything
 
-        for message in self.get_value():
-            print(message)
+        # Write the whole buffer at once rather than a print() per line
+        # NOTE: the trailing newline is written separately, since appending it to
+        # the joined string would copy the whole output once more
+        write = sys.stdout.write
+        write("\n".join(self._messages))
+        write("\n")
     
\ No newline at end of file
@@ -8,9 +8,19 @@ from this root class.
 import unittest
 import tempfile
 import subprocess
+import io
+import os
 import sys
+from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
 
+from gitree.main import main
+
+
+# Base dir for the temporary test dirs, None for the default temp dir
+_TMP_BASE = ("/dev/shm" if sys.platform.startswith("linux") and 
+    os.access("/dev/shm", os.W_OK) else None)
+
 
 class BaseCLISetup(unittest.TestCase):
     """
@@ -25,7 +35,9 @@ class BaseCLISetup(unittest.TestCase):
         Use self.root everywhere to create temporary files
         """
 
-        self._tmpdir = tempfile.TemporaryDirectory()
+        # NOTE: on Linux the dir is made in the RAM-backed /dev/shm when available,
+        # so the test files never hit the disk
+        self._tmpdir = tempfile.TemporaryDirectory(dir=_TMP_BASE)
         self.root = Path(self._tmpdir.name)
 
         # Vars to be used for all other tests
@@ -45,16 +57,37 @@ class BaseCLISetup(unittest.TestCase):
         Helper to run gitree with the CLI consistently. The path given to the tool is
         the temporary dir path.
 
+        NOTE: the tool is run in this process, with its stdout/stderr captured,
+        instead of starting a new interpreter for every run. The result has the
+        same fields as the one of subprocess.run
+
         Args:
             args (tuple): extra CLI arguments, e.g. "--max-depth 1", "--help", "--zip output.zip"
         """
 
-        return subprocess.run(
-            [sys.executable, "-m", "gitree.main", *args],
-            cwd=self.root,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
+        stdout, stderr = io.StringIO(), io.StringIO()
+        returncode = 0
+
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    main(list(args))
+                except SystemExit as e:
+                    if isinstance(e.code, int):
+                        returncode = e.code
+                    elif e.code is not None:
+                        print(e.code, file=stderr)
+                        returncode = 1
+        finally:
+            os.chdir(cwd)
+
+        return subprocess.CompletedProcess(
+            args=["gitree", *args],
+            returncode=returncode,
+            stdout=stdout.getvalue(),
+            stderr=stderr.getvalue(),
         )
 
 
@@ -1,4 +1,4 @@
-# tests/test_basic.py
+# tests/test_general_options.py
 
 """
 Code file for TestGeneralOptions class.
@@ -92,3 +92,26 @@ class TestGeneralOptions(BaseCLISetup):
         self.assertIn("LOG", result.stdout,
             msg=self.failed_run_msg(args_str) +
                 f"Expected str 'LOG' not found in output: \n\n{result.stdout}")
+
+
+    def test_missing_path(self):
+        """
+        Test if a path that does not exist is reported as an error,
+        instead of being skipped.
+        """
+
+        # Vars
+        (self.root / "file.txt").write_text("hello", encoding="utf-8")
+        args_str = "file.txt missing"
+
+        # Run
+        result = self.run_gitree("file.txt", "missing")
+
+        # Validate
+        self.assertEqual(result.returncode, 1,
+            msg=self.failed_run_msg(args_str) +
+                f"Expected exit code 1, got: {result.returncode}")
+
+        self.assertIn("missing", result.stderr,
+            msg=self.failed_run_msg(args_str) +
+                f"Missing path not reported in stderr: \n\n{result.stderr}")
@@ -1,4 +1,4 @@
-# tests/test_io_flags.py
+# tests/test_io_options.py
 import zipfile
 
 from tests.base_setup import BaseCLISetup
@@ -34,6 +34,60 @@ class TestIOFlags(BaseCLISetup):
             self.assertIn("file.txt", names)
 
 
+    def test_zip_skips_itself(self):
+        """
+        Verify that an existing zip at the output path (e.g. from a previous run)
+        is not added into the new zip archive.
+        """
+        (self.root / "file.txt").write_text("hello", encoding="utf-8")
+
+        zip_path = self.root / "output.zip"
+
+        self.run_gitree("--zip", zip_path.name)
+        result = self.run_gitree("--zip", zip_path.name, "--override-files")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.namelist(), ["file.txt"])
+
+
+    def test_zip_stores_compressed_files(self):
+        """
+        Verify that already compressed files (e.g. .png) are stored in the zip
+        archive without deflating them again, while other files are deflated.
+        """
+        (self.root / "image.png").write_bytes(b"\x89PNG" + b"\x00" * 256)
+        (self.root / "file.txt").write_text("hello " * 50, encoding="utf-8")
+
+        zip_path = self.root / "output.zip"
+
+        result = self.run_gitree("--zip", zip_path.name)
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.getinfo("image.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("file.txt").compress_type, zipfile.ZIP_DEFLATED)
+
+
+    def test_zip_compression(self):
+        """
+        Verify that the --zip-compression flag sets the compression method
+        of the files in the zip archive.
+        """
+        (self.root / "file.txt").write_text("hello " * 50, encoding="utf-8")
+
+        zip_path = self.root / "output.zip"
+
+        result = self.run_gitree("--zip", zip_path.name, "--zip-compression", "stored")
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.getinfo("file.txt").compress_type, zipfile.ZIP_STORED)
+
+
     def test_export(self):
         """
         Verify that the --export flag writes the directory tree output
@@ -49,3 +103,20 @@ class TestIOFlags(BaseCLISetup):
         content = out_path.read_text()
         self.assertIn("CONTENTS", content)
 
+
+    def test_export_skips_binary_extensions(self):
+        """
+        Verify that files with a known binary extension are exported as binary,
+        even when their content looks like text.
+        """
+        (self.root / "doc.pdf").write_text("%PDF-1.4 text-like header", encoding="utf-8")
+
+        out_path = self.root / "tree_export.txt"
+
+        result = self.run_gitree("--export", out_path.name)
+
+        self.assertEqual(result.returncode, 0, msg=result.stderr)
+
+        content = out_path.read_text()
+        self.assertIn("[binary file]", content)
+        self.assertNotIn("text-like header", content)
@@ -1,4 +1,4 @@
-# tests/test_listing_flags.py
+# tests/test_listing_options.py
 from gitree.constants.constant import FILE_EMOJI, EMPTY_DIR_EMOJI, NORMAL_DIR_EMOJI
 from tests.base_setup import BaseCLISetup
 
@@ -1,4 +1,4 @@
-# tests/test_listing_control_flags.py
+# tests/test_listing_override_options.py
 from tests.base_setup import BaseCLISetup
 
 